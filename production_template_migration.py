@@ -3,18 +3,19 @@ import streamlit as st
 from jira import JIRA, JIRAError
 from dotenv import load_dotenv
 import os
-import requests
-from requests.auth import HTTPBasicAuth
 from datetime import datetime
 from datetime import timedelta
-import pandas as pd
-import plotly.express as px
 import tempfile
-import io
+import json
+import logging
+import asyncio
+import aiohttp
 
 # Load .env if present
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # -------------------
 # Helpers
 # -------------------
@@ -26,7 +27,9 @@ def create_jira_connection(url: str, username: str, token_or_password: str, clou
     """
     options = {"server": url}
     try:
-        jira = JIRA(options=options, basic_auth=(username, token_or_password))
+        # async_ : la pagination de search_issues se fait en parallèle
+        # via requests-futures au lieu de pages séquentielles
+        jira = JIRA(options=options, basic_auth=(username, token_or_password), async_=True, async_workers=5)
         jira.myself()  # Test simple pour valider la connexion
         return jira
     except JIRAError as e:
@@ -146,168 +149,203 @@ if not jira_login_page():
     st.stop()
 
 
+def session_cache_get(key: str, ttl_seconds: int, loader):
+    """
+    Cache léger dans st.session_state pour les lectures Jira qui changent
+    rarement : un rerun Streamlit servi depuis le cache ne touche pas le
+    réseau. Les clés sont préfixées "cache::" et purgées à la déconnexion.
+    """
+    entry = st.session_state.get(key)
+    if entry is not None:
+        cached_at, value = entry
+        if datetime.now() - cached_at < timedelta(seconds=ttl_seconds):
+            return value
+    value = loader()
+    st.session_state[key] = (datetime.now(), value)
+    return value
+
+def clear_session_cache():
+    for key in [k for k in st.session_state.keys() if str(k).startswith("cache::")]:
+        del st.session_state[key]
+
 def safe_get_projects(jira):
     try:
-        return jira.projects()
+        return session_cache_get(f"cache::projects::{jira.server_url}", 300, jira.projects)
     except Exception:
         return []
 
-def rest_api_get(base_url: str, path: str, auth: HTTPBasicAuth, params: dict = None):
+def get_project_category(p):
+    """Nom de catégorie d'un projet (objet Jira Python API OU dict REST)."""
+    cat = getattr(p, "projectCategory", None)
+    if cat is None:
+        return None
+    if isinstance(cat, dict):
+        return cat.get("name")
+    return getattr(cat, "name", None)
+
+@st.cache_resource(ttl=300)
+def load_production_projects(base_url: str, username: str):
     """
-    Appel GET vers l'API Jira v3.
+    Projets de la catégorie "Production" : une seule passe construit la
+    liste filtrée et les mappings clé->projet et nom->clé, le tout servi
+    depuis le cache entre les reruns. Le client jira n'est pas hashable :
+    il est lu dans st.session_state, base_url/username servent de clé de
+    cache. (cache_resource : les objets Project ne sont pas picklables)
+    """
+    projects = safe_get_projects(st.session_state.jira_client)
+    filtered = []
+    projects_map = {}
+    project_labels = {}
+    for p in projects:
+        if get_project_category(p) != "Production":
+            continue
+        filtered.append(p)
+        projects_map[p.key] = p
+        project_labels[f"{p.name}"] = p.key
+    return filtered, projects_map, project_labels
+
+def get_jql_template_epic(jira_client, maxResults=False):
+    """
+    EPICs du projet template via jira.search_issues : la pagination est
+    gérée (et parallélisée, client async_) par la librairie.
+    maxResults=False : récupérer toutes les pages.
     """
-    url = base_url.rstrip("/") + path
-    headers = {"Accept": "application/json"}
-    resp = requests.get(url, headers=headers, auth=auth, params=params, timeout=30)
-    if resp.status_code >= 400:
-        raise Exception(f"API error {resp.status_code}: {resp.text}")
-    return resp.json()
-
-def get_jql_template_epic(base_url: str, auth: HTTPBasicAuth, maxResults=50):
-
     jql = "project = PPT AND issuetype = Epic ORDER BY created DESC"
+    fields = "summary,description,status,assignee,customfield_10015,duedate,attachment"
+    issues = jira_client.search_issues(jql, fields=fields, maxResults=maxResults)
+    return [issue.raw for issue in issues]
 
-    params = {
-        "jql": jql,
-        "startAt": 0,
-        "maxResults": 50,
-        "fields": "summary,description,status,assignee,customfield_10015,attachment"
-    }
-
-    url = f"{base_url}/rest/api/3/search/jql"
-    resp = requests.get(url, headers={"Accept": "application/json"}, auth=auth, params=params)
-
-    if resp.status_code == 200:
-        data = resp.json()
-        issues = data.get("issues", [])
-        for issue in issues:
-            key = issue["key"]
-            fields = issue["fields"]
-            summary = fields.get("summary")
-            status = fields.get("status", {}).get("name")
-            start_date = fields.get("customfield_10015")
-            print(f"Issue {key}: {summary} — status: {status}")
-    else:
-        print(f"Erreur HTTP {resp.status_code}: {resp.text}")
-
-    return data.get("issues", [])
+# Fields enfants : jeu complet pour la migration, jeu réduit pour le Gantt
+# (description ADF et issuelinks pèsent plusieurs KB par issue)
+CHILD_FIELDS_FULL = "summary,status,assignee,reporter,description,customfield_10015,duedate,issuelinks,issuetype,attachment"
+CHILD_FIELDS_GANTT = "summary,customfield_10015,duedate,issuetype"
 
-def get_child_issues_for_epic(base_url: str, auth: HTTPBasicAuth, epic_key: str, maxResults=100):
+def get_child_issues_for_epic(jira_client, epic_key: str, fields: str = CHILD_FIELDS_FULL, maxResults=False):
     jql = f'"parent" = {epic_key} ORDER BY startdate ASC'
-    params = {
-        "jql": jql,
-        "maxResults": maxResults,
-        "fields": "summary,status,assignee,reporter,description,customfield_10015,duedate,issuelinks,issuetype,attachment"
-    }
-    url = f"{base_url}/rest/api/3/search/jql"
-    resp = requests.get(url, headers={"Accept": "application/json"}, auth=auth, params=params)
-
-    if resp.status_code == 200:
-        data = resp.json()
-        issues = data.get("issues", [])
-        for issue in issues:
-            key = issue["key"]
-            fields = issue["fields"]
-            summary = fields.get("summary")
-            status = fields.get("status", {}).get("name")
-            start_date = fields.get("customfield_10015")  # Start date
-            due_date = fields.get("duedate")              # Due date
-            links = fields.get("issuelinks", [])
-            print(f"Issue {key}: {summary} — status: {status}")
-    else:
-        print(f"Erreur HTTP {resp.status_code}: {resp.text}")
+    issues = jira_client.search_issues(jql, fields=fields, maxResults=maxResults)
+    return ordre_child_issues([issue.raw for issue in issues])
 
-    issues = data.get("issues", [])
-    ordre_issues = ordre_child_issues(issues)
-    return ordre_issues
+def get_child_issues_cached(jira_client, epic_key: str, fields: str = CHILD_FIELDS_FULL):
+    """
+    Mémoïse les enfants d'un EPIC (clé : epic + fields) : cliquer deux fois
+    sur le preview ou relancer une migration ne refait pas la requête JQL.
+    """
+    return session_cache_get(
+        f"cache::children::{epic_key}::{fields}", 300,
+        lambda: get_child_issues_for_epic(jira_client, epic_key, fields=fields)
+    )
 
 def ordre_child_issues(issues):
     """
     Trie une liste d'issues par customfield_10015 (start date) croissant.
     Les issues sans start date sont placées à la fin.
+    Chaque date n'est parsée qu'une seule fois (decorate-sort-undecorate).
     """
-    def get_start_date(issue):
+    keyed = []
+    for issue in issues:
         start = issue.get("fields", {}).get("customfield_10015")
         if start:
             try:
-                return datetime.fromisoformat(str(start))
+                start_dt = datetime.fromisoformat(str(start))
             except Exception:
-                return datetime.max  # Si format invalide, les mettre à la fin
+                start_dt = datetime.max  # Si format invalide, les mettre à la fin
         else:
-            return datetime.max  # Si pas de start date, les mettre à la fin
-
-    return sorted(issues, key=get_start_date)
-
+            start_dt = datetime.max  # Si pas de start date, les mettre à la fin
+        keyed.append((start_dt, issue))
+
+    keyed.sort(key=lambda pair: pair[0])
+    return [issue for _, issue in keyed]
+
+
+def _adf_paragraph(block, lines):
+    # Paragraphe
+    lines.append("".join(
+        c.get("text", "") for c in block.get("content", []) if c.get("type") == "text"
+    ))
+    lines.append("")
+
+def _adf_bullet_list(block, lines):
+    # Liste à puce : extraction à plat de tous les noeuds texte, puis un
+    # seul extend (str() en garde-fou si un noeud n'est pas une chaîne)
+    items = [
+        c.get("text", "")
+        for item in block.get("content", [])
+        for p in item.get("content", [])
+        for c in p.get("content", [])
+        if c.get("type") == "text"
+    ]
+    lines.extend("- " + str(t) for t in items)
+    lines.append("")
+
+def _adf_noop(block, lines):
+    pass
+
+# Dispatch par type de bloc ADF : un lookup dict au lieu d'une chaîne if/elif
+_ADF_HANDLERS = {
+    "paragraph": _adf_paragraph,
+    "bulletList": _adf_bullet_list,
+}
 
 def adf_to_markdown(adf):
     """Convertit un document Atlassian ADF en markdown affichable."""
+    # Court-circuit : description absente ou déjà en texte brut (API v2)
     if not adf:
         return ""
+    if isinstance(adf, str):
+        return adf
+    if not isinstance(adf, dict):
+        return ""
 
-    md = ""
-
+    lines = []
     for block in adf.get("content", []):
-        btype = block.get("type")
-
-        # Paragraphe
-        if btype == "paragraph":
-            line = ""
-            for c in block.get("content", []):
-                if c.get("type") == "text":
-                    line += c.get("text", "")
-            md += line + "\n\n"
-
-        # Liste à puce
-        elif btype == "bulletList":
-            for item in block.get("content", []):
-                for p in item.get("content", []):
-                    for c in p.get("content", []):
-                        if c.get("type") == "text":
-                            md += f"- {c['text']}\n"
-            md += "\n"
-
-    return md.strip()
+        _ADF_HANDLERS.get(block.get("type"), _adf_noop)(block, lines)
+
+    return "\n".join(lines).strip()
 
 def to_datetime_safe(value):
-    
+
     if not value:  # None, '', etc.
         return None
     try:
-        print(datetime.fromisoformat(str(value)))
         return datetime.fromisoformat(str(value))
     except Exception as e:
-        print(f"Impossible de convertir '{value}' ({type(value)}): {e}")
+        logger.debug("Impossible de convertir '%s' (%s): %s", value, type(value), e)
         return None
 
-def download_attachment(url, auth):
-    resp = requests.get(url, auth=auth)
-    if resp.status_code == 200:
-        return resp.content
-    else:
-        raise Exception(f"Attachment download failed: {resp.status_code}")
-
-
-def migrate_attachment_epic(jira_client, auth, attachment, issue_key, project_suffix=""):
-    """Migre un attachment Epic (objet Attachment Jira)"""
-    filename = f"{project_suffix} - {attachment.filename}" if project_suffix else attachment.filename
-    resp = requests.get(attachment.content, auth=auth, timeout=30)
-    if resp.status_code >= 400:
-        raise Exception(f"Erreur téléchargement fichier {filename}: {resp.status_code}")
-    file_data = io.BytesIO(resp.content)
-    jira_client.add_attachment(issue=issue_key, filename=filename, attachment=file_data)
-
-def migrate_attachment_child(jira_client, auth, attachment_dict, issue_key, project_suffix=""):
-    attachments = fields.get("attachment", [])
-    for att in attachments:
-        if isinstance(att, dict):  # REST API
-            filename = f"{selected_label} - {att['filename']}"
-            file_content = requests.get(att['content'], auth=HTTPBasicAuth(st.session_state.username, st.session_state.token)).content
-        else:  # objet Attachment (Epic)
-            filename = f"{selected_label} - {att.filename}"
-            file_content = att.content
-
-        file_data = io.BytesIO(file_content)
-        jira.add_attachment(issue=new_issue.key, filename=filename, attachment=file_data)
+# -------------------
+# Migration asynchrone (aiohttp)
+# -------------------
+# La migration est un fan-out I/O pur : création EPIC, N enfants, M liens,
+# tous des appels HTTPS indépendants. Ils sont envoyés via aiohttp et
+# asyncio.gather, bornés par un Semaphore pour le rate limiting Jira.
+
+async def aio_post_json(session, sem, url, payload):
+    """POST JSON sous sémaphore ; lève une exception en cas d'erreur HTTP."""
+    async with sem:
+        async with session.post(url, json=payload) as resp:
+            text = await resp.text()
+            if resp.status >= 400:
+                raise Exception(f"API error {resp.status}: {text}")
+            return json.loads(text) if text else {}
+
+async def aio_download_attachment(session, sem, url):
+    async with sem:
+        async with session.get(url) as resp:
+            if resp.status >= 400:
+                raise Exception(f"Attachment download failed: {resp.status}")
+            return await resp.read()
+
+async def aio_upload_attachment(session, sem, base_url, issue_key, filename, content):
+    form = aiohttp.FormData()
+    form.add_field("file", content, filename=filename)
+    async with sem:
+        async with session.post(
+            f"{base_url}/rest/api/2/issue/{issue_key}/attachments",
+            data=form,
+            headers={"X-Atlassian-Token": "no-check"},
+        ) as resp:
+            if resp.status >= 400:
+                raise Exception(f"Erreur upload fichier {filename}: {resp.status} {await resp.text()}")
 
 # -------------------
 # Streamlit UI
@@ -338,42 +376,29 @@ if st.button("Disconnect"):
     st.session_state.jira_client = None
     st.session_state.login_attempt = False
     st.session_state.epics_list = []
+    clear_session_cache()
+    load_production_projects.clear()
     st.experimental_rerun = False  # ne plus utiliser, Streamlit recalculera automatiquement
     st.info("Disconnected, go back to connection page")
 
 if st.session_state.connected and st.session_state.jira_client:
     jira = st.session_state.jira_client
     base_url = st.session_state.jira_client.server_url
-    auth = HTTPBasicAuth(st.session_state.username, st.session_state.token)
-
-    # Liste des projets
-    projects = safe_get_projects(jira)
 
-    #--- Start filter projetcs by category
-    filtered_projects = []
-    for p in projects:
-        cat = None
-        if hasattr(p, "projectCategory") and p.projectCategory:
-            # Try both formats (Jira Python API OR REST dict)
-            if hasattr(p.projectCategory, "name"):
-                cat = p.projectCategory.name
-            elif isinstance(p.projectCategory, dict):
-                cat = p.projectCategory.get("name")
+    # Nombre d'appels Jira en parallèle pendant la migration
+    # (limité pour respecter le rate limiting Atlassian Cloud)
+    max_workers = st.sidebar.slider("Parallel Jira requests", min_value=1, max_value=10, value=5)
 
-        if cat == "Production":
-            filtered_projects.append(p)
+    # Liste des projets (catégorie Production), servie depuis le cache :
+    # un rerun de widget ne refait ni l'appel réseau ni le filtrage
+    filtered_projects, projects_map, project_labels = load_production_projects(base_url, st.session_state.username)
 
     if not filtered_projects:
         st.info("Aucun projet dans la catégorie Production.")
         st.stop()
 
-    #--- End filter projetcs by category
-
-    projects_map = {p.key: p for p in filtered_projects}
     project_keys = list(projects_map.keys())
 
-    project_labels = {f"{p.name}": p.key for p in filtered_projects}
-
     if not project_keys:
         st.info("Aucun projet trouvé ou pas accès.")
     else:
@@ -391,18 +416,17 @@ if st.session_state.connected and st.session_state.jira_client:
 
         try:
             with st.spinner(""):
-                epics = get_jql_template_epic(base_url, auth, maxResults=100)
+                epics = session_cache_get(
+                    f"cache::epics::{base_url}", 300,
+                    lambda: get_jql_template_epic(jira)
+                )
             if not epics:
                 st.info("Aucun EPIC trouvé pour ce JQL.")
                 st.session_state.epics_list = []
             else:
-                epics_map = {
-                    e["key"]: {
-                        "summary": e["fields"].get("summary", ""),
-                        "description": e["fields"].get("description", "")
-                    } 
-                    for e in epics
-                }
+                # On garde tous les fields retournés par le JQL : les branches
+                # Gantt et migration les relisent sans re-appeler jira.issue()
+                epics_map = {e["key"]: e["fields"] for e in epics}
                 st.session_state.epics_list = epics_map
         except Exception as e:
             st.error(f"Erreur en récupérant les Epics : {e}")
@@ -420,8 +444,12 @@ if st.session_state.connected and st.session_state.jira_client:
             st.write(f"Selected Process: {selected_epic_data['summary']}")
             st.markdown("### Process Description")
 
-            description_adf = selected_epic_data["description"] 
-            markdown_description = adf_to_markdown(description_adf)
+            description_adf = selected_epic_data["description"]
+            # Conversion mémoïsée par EPIC : pas de re-parse à chaque rerun
+            markdown_description = session_cache_get(
+                f"cache::epic_md::{selected_epic}", 300,
+                lambda: adf_to_markdown(description_adf)
+            )
 
             st.markdown(markdown_description)
 
@@ -432,9 +460,14 @@ if st.session_state.connected and st.session_state.jira_client:
             )
 
             if st.button("Show process issues"):
+                # Imports différés : pandas/plotly ne sont chargés que quand
+                # le Gantt est rendu, les autres reruns ne paient pas l'import
+                import pandas as pd
+                import plotly.express as px
+
                 try:
                     with st.spinner("Collecting issues..."):
-                        child_issues = get_child_issues_for_epic(base_url, auth, selected_epic, maxResults=200)
+                        child_issues = get_child_issues_cached(jira, selected_epic, fields=CHILD_FIELDS_GANTT)
 
                     if not child_issues:
                         st.info(f"No issue found for : {selected_epic}.")
@@ -445,15 +478,13 @@ if st.session_state.connected and st.session_state.jira_client:
                         # 🔵 AJOUT DE L'ÉPIC AU DIAGRAMME DE GANTT
                         # --------------------------------------------------------------
 
-                        # Récupération de l’EPIC d’origine
-                        epic_issue = jira.issue(selected_epic)
-                        epic_fields = epic_issue.fields   
-
-            
+                        # Fields de l'EPIC d'origine, déjà présents dans le
+                        # payload JQL mis en cache
+                        epic_fields = st.session_state.epics_list[selected_epic]
 
                         # Dates EPIC originales
-                        epic_start_orig = epic_fields.customfield_10015
-                        epic_due_orig = epic_fields.duedate
+                        epic_start_orig = epic_fields.get("customfield_10015")
+                        epic_due_orig = epic_fields.get("duedate")
 
                         if epic_start_orig:
                             epic_start_dt = to_datetime_safe(epic_start_orig)
@@ -494,50 +525,28 @@ if st.session_state.connected and st.session_state.jira_client:
 
 
 
-                        for ch in child_issues:
-                            key = ch.get("key")
-                            f = ch.get("fields", {})
-
-
-
-                            start_orig = f.get("customfield_10015")
-                            due_orig = f.get("duedate")
-
-                            if start_orig:
-                                start_dt = datetime.fromisoformat(start_orig.replace("Z", ""))
-                                start_gantt = start_dt + delta_epic
-                            else:
-                                start_gantt = None
-
-                            if start_orig and due_orig:
-                                due_dt = datetime.fromisoformat(due_orig.replace("Z", ""))
-                                due_gantt = due_dt + delta_epic
-                            else:
-                                due_gantt = None
-
-                            start = start_gantt   # Start date
-                            end = due_gantt            # Due date
-
-                            summary = f.get("summary", "—")
-                            issue_type = f.get("issuetype", {}).get("name", "—")
+                        # Flatten des issues en un seul passage, puis toute
+                        # l'arithmétique de dates en opérations colonnes
+                        df_children = pd.json_normalize(child_issues, sep=".")
 
-                            if start and end:
-                                try:
+                        df_children["Task"] = df_children["key"] + " — " + df_children["fields.summary"].fillna("—")
+                        df_children["Start"] = pd.to_datetime(df_children["fields.customfield_10015"], errors="coerce") + delta_epic
+                        df_children["Finish"] = pd.to_datetime(df_children["fields.duedate"], errors="coerce") + delta_epic
+                        df_children["Type"] = df_children["fields.issuetype.name"].fillna("—")
+                        df_children["Epic"] = selected_epic_data["summary"]  # 🔥 On ajoute l'EPIC ici
 
-                                    duration_days = (end - start).days
-                                except:
-                                    duration_days = None
+                        # On ne garde que les tâches datées (Start + Due)
+                        df_children = df_children.dropna(subset=["Start", "Finish"])
 
-                                gantt_data.append({
-                                    "Task": f"{key} — {summary}",
-                                    "Start": start,
-                                    "Finish": end,
-                                    "Duration": duration_days,
-                                    "Type": issue_type,
-                                    "Epic": selected_epic_data["summary"]  # 🔥 On ajoute l'EPIC ici
-                                })
+                        # Duration après le dropna : plus de NaN, la colonne
+                        # reste en int ("12 Days" et non "12.0 Days")
+                        df_children["Duration"] = (df_children["Finish"] - df_children["Start"]).dt.days.astype(int)
 
-                        df_gantt = pd.DataFrame(gantt_data)
+                        df_gantt = pd.concat(
+                            [pd.DataFrame(gantt_data),
+                             df_children[["Task", "Start", "Finish", "Duration", "Type", "Epic"]]],
+                            ignore_index=True
+                        )
 
                         if not df_gantt.empty:
                             
@@ -550,6 +559,7 @@ if st.session_state.connected and st.session_state.jira_client:
 
                             st.subheader("Process Gant Diagram")
 
+                            # Figure construite en une seule passe (appel chaîné)
                             fig = px.timeline(
                                 df_gantt,
                                 x_start="Start",
@@ -557,10 +567,9 @@ if st.session_state.connected and st.session_state.jira_client:
                                 y="Task",
                                 color="Type",
                                 text="DurationLabel"     # 🏷️ Afficher "X Days" dans la barre
-                            )
-
-                            fig.update_traces(textposition="inside", insidetextanchor="middle")
-                            fig.update_yaxes(autorange="max reversed")
+                            ).update_traces(
+                                textposition="inside", insidetextanchor="middle"
+                            ).update_yaxes(autorange="max reversed")
 
                             st.plotly_chart(fig, use_container_width=True)
 
@@ -586,22 +595,20 @@ if st.button("Migrate Template"):
     try:
         st.write("📌 Migration under process...")
 
-        child_issues = get_child_issues_for_epic(base_url, auth, selected_epic, maxResults=200)     
+        child_issues = get_child_issues_cached(jira, selected_epic)     
         child_links_map  = {}
         old_to_new_keys = {}
 
         total_steps = len(child_issues) + 1  # +1 pour l'EPIC
         progress_bar = st.progress(0)
         status_text = st.empty()
-        current_step = 0
 
-        # Récupération de l’EPIC d’origine
-        epic_issue = jira.issue(selected_epic)
-        epic_fields = epic_issue.fields
-        
+        # Fields de l'EPIC d'origine, déjà présents dans le payload JQL
+        epic_fields = st.session_state.epics_list[selected_epic]
+
         # Dates EPIC origine
-        epic_start = epic_fields.customfield_10015
-        epic_due = epic_fields.duedate
+        epic_start = epic_fields.get("customfield_10015")
+        epic_due = epic_fields.get("duedate")
         epic_duration = 0
 
         # Conversion si existe
@@ -620,38 +627,52 @@ if st.button("Migrate Template"):
         # ---------------------------------------------------------
         new_epic_data = {
             "project": {"key": selected_key},
-            "summary": epic_fields.summary,
-            "description": epic_fields.description,
+            "summary": epic_fields.get("summary"),
+            "description": adf_to_markdown(epic_fields.get("description")),
             "issuetype": {"name": "Epic"},
             "customfield_10015": new_start_date.strftime("%Y-%m-%d"),
             "duedate": (new_start_date + epic_duration).strftime("%Y-%m-%d")
         }
 
-        new_epic = jira.create_issue(fields=new_epic_data)
+        epic_attachments = epic_fields.get("attachment", [])
 
-        epic_attachments = epic_fields.attachment
-
-        for att in epic_attachments:
-            file_data = download_attachment(
-                att.content,
-                auth=HTTPBasicAuth(st.session_state.username, st.session_state.token)
-            )
-            migrate_attachment_epic(jira, auth,att, new_epic.key,project_suffix = selected_label)
-
-        st.success(f"New EPIC created : {new_epic.key}")
+        # ---------------------------------------------------------
+        # 2. Recréer chaque enfant avec delta date
+        # ---------------------------------------------------------
+        # EPIC, enfants et liens sont des appels HTTPS indépendants :
+        # tout le flux passe par aiohttp + asyncio.gather, borné par un
+        # Semaphore(max_workers) pour respecter le rate limiting.
+
+        # Types de ticket du projet cible, résolus une seule fois
+        # (un seul GET /project/{key} au lieu d'un par enfant)
+        issue_type_map = session_cache_get(
+            f"cache::issuetypes::{selected_key}", 300,
+            lambda: {itype.name: itype.id for itype in jira.project(selected_key).issueTypes}
+        )
 
-        current_step += 1
-        progress_bar.progress(current_step / total_steps)
+        # Dates enfants parsées et décalées en un seul passage vectorisé
+        # (pd.to_datetime + arithmétique colonne) au lieu de 4 parses
+        # Python par enfant dans la boucle de création
+        import pandas as pd
 
+        df_dates = pd.DataFrame({
+            "key": [ch["key"] for ch in child_issues],
+            "start": pd.to_datetime([ch["fields"].get("customfield_10015") for ch in child_issues], errors="coerce"),
+            "due": pd.to_datetime([ch["fields"].get("duedate") for ch in child_issues], errors="coerce"),
+        })
 
-        
+        if epic_start_dt:
+            delta_epic = pd.Timestamp(new_start_date) - pd.Timestamp(epic_start_dt)
+            df_dates["new_start"] = df_dates["start"] + delta_epic
+        else:
+            df_dates["new_start"] = pd.NaT
+        # new_due = new_start + durée d'origine (due - start)
+        df_dates["new_due"] = df_dates["new_start"] + (df_dates["due"] - df_dates["start"])
 
-        # ---------------------------------------------------------
-        # 2. Recréer chaque enfant avec delta date
-        # ---------------------------------------------------------
-        
+        child_dates = {row.key: (row.new_start, row.new_due) for row in df_dates.itertuples()}
 
-        for ch in child_issues:
+        def _build_child_payload(ch, new_epic_key):
+            """Payload de création + liens et attachments d'origine d'un enfant."""
             ch_key = ch["key"]
             fields = ch["fields"]
 
@@ -672,41 +693,15 @@ if st.button("Migrate Template"):
                         "direction": "inward",
                         "key": link["inwardIssue"]["key"]
                     })
-            
-            child_links_map[ch_key] = original_links
-
-            #--- End stock links 
 
-            orig_start = fields.get("customfield_10015")
-            orig_due = fields.get("duedate")
-
-            # Calcul du delta si possible
-            if epic_start_dt and orig_start:
-                child_start_dt = datetime.fromisoformat(orig_start.replace("Z", ""))
-                delta_days = (child_start_dt - epic_start_dt).days
-                new_child_start = new_start_date + timedelta(days=delta_days)
-            else:
-                new_child_start = None
-
-            # Nouvelle date de fin
-            if orig_start and orig_due:
-                start_dt = datetime.fromisoformat(orig_start.replace("Z", ""))
-                due_dt = datetime.fromisoformat(orig_due.replace("Z", ""))
-                duration = (due_dt - start_dt).days
-                new_child_due = (new_child_start + timedelta(days=duration)) if new_child_start else None
-            else:
-                new_child_due = None
+            #--- End stock links
 
-            # 1️⃣ Obtenir les types de ticket du projet cible
-            issue_types = jira.project(selected_key).issueTypes  # liste d'objets IssueType
+            # Dates décalées pré-calculées vectoriellement (cf. child_dates)
+            new_child_start, new_child_due = child_dates.get(ch_key, (None, None))
 
-            # 2️⃣ Trouver l'ID correspondant au type de l'enfant
+            # Retrouver l'ID correspondant au type de l'enfant
             child_type_name = fields.get("issuetype", {}).get("name")  # "Task", "Bug", etc.
-            child_type_id = None
-            for itype in issue_types:
-                if itype.name == child_type_name:
-                    child_type_id = itype.id
-                    break
+            child_type_id = issue_type_map.get(child_type_name)
 
             if not child_type_id:
                 raise Exception(f"Error while migrating '{child_type_name}' in the project {selected_key}")
@@ -718,49 +713,96 @@ if st.button("Migrate Template"):
                 "summary": fields.get("summary"),
                 "description": adf_to_markdown(fields.get("description")),
                 "issuetype": {"id": child_type_id},
-                "customfield_10014": new_epic.key,  # Lien vers l'epic parent
+                "customfield_10014": new_epic_key,  # Lien vers l'epic parent
             }
 
             # Ajouter dates
-            if new_child_start:
+            if pd.notna(new_child_start):
                 create_payload["customfield_10015"] = new_child_start.strftime("%Y-%m-%d")
-            if new_child_due:
+            if pd.notna(new_child_due):
                 create_payload["duedate"] = new_child_due.strftime("%Y-%m-%d")
 
-            # Création
-            new_issue = jira.create_issue(fields=create_payload)
+            return ch_key, create_payload, original_links, fields.get("attachment", [])
+
+        async def _migrate():
+            sem = asyncio.Semaphore(max_workers)
+            connector = aiohttp.TCPConnector(limit=20)
+            aio_auth = aiohttp.BasicAuth(st.session_state.username, st.session_state.token)
+
+            async with aiohttp.ClientSession(connector=connector, auth=aio_auth,
+                                             headers={"Accept": "application/json"}) as session:
+                issue_url = f"{base_url}/rest/api/2/issue"
+
+                async def _migrate_attachment(issue_key, att):
+                    content = await aio_download_attachment(session, sem, att["content"])
+                    filename = f"{selected_label} - {att['filename']}"
+                    await aio_upload_attachment(session, sem, base_url, issue_key, filename, content)
+
+                # 1. EPIC d'abord : les enfants ont besoin de sa clé
+                created = await aio_post_json(session, sem, issue_url, {"fields": new_epic_data})
+                new_epic_key = created["key"]
+
+                await asyncio.gather(*[_migrate_attachment(new_epic_key, att) for att in epic_attachments])
+
+                st.success(f"New EPIC created : {new_epic_key}")
+
+                done = 1  # EPIC
+                progress_bar.progress(done / total_steps)
+
+                # 2. Enfants en parallèle
+                async def _create_child(ch):
+                    ch_key, payload, links, attachments = _build_child_payload(ch, new_epic_key)
+                    data = await aio_post_json(session, sem, issue_url, {"fields": payload})
+                    new_key = data["key"]
+                    await asyncio.gather(*[_migrate_attachment(new_key, att) for att in attachments])
+                    return ch_key, new_key, links
+
+                # La progress bar est mise à jour au fil des complétions,
+                # toujours depuis le thread principal (asyncio.run y tourne)
+                for coro in asyncio.as_completed([_create_child(ch) for ch in child_issues]):
+                    ch_key, new_key, original_links = await coro
+                    old_to_new_keys[ch_key] = new_key
+                    child_links_map[ch_key] = original_links
+                    done += 1
+                    progress_bar.progress(done / total_steps)
+
+                st.success(f"Issues creation complete, migrating dependencies...")
+
+                # 3. Liens dédupliqués, créés en parallèle
+                link_jobs = []
+                seen_links = set()
+                for old_key, links in child_links_map.items():
+                    new_key = old_to_new_keys.get(old_key)
+                    if not new_key:
+                        continue
+                    for link in links:
+                        linked_old_key = link["key"]
+                        linked_new_key = old_to_new_keys.get(linked_old_key)
+                        if not linked_new_key:
+                            continue  # ignore les liens vers des issues hors template
+                        # Chaque lien apparaît sur les deux issues (inward +
+                        # outward) : on ne le recrée qu'une seule fois
+                        canon = tuple(sorted((old_key, linked_old_key))) + (link["type"],)
+                        if canon in seen_links:
+                            continue
+                        seen_links.add(canon)
+                        if link["direction"] == "outward":
+                            link_jobs.append((link["type"], new_key, linked_new_key))
+                        else:
+                            link_jobs.append((link["type"], linked_new_key, new_key))
+
+                link_url = f"{base_url}/rest/api/2/issueLink"
+                await asyncio.gather(*[
+                    aio_post_json(session, sem, link_url, {
+                        "type": {"name": ltype},
+                        "inwardIssue": {"key": inward},
+                        "outwardIssue": {"key": outward}
+                    })
+                    for ltype, inward, outward in link_jobs
+                ])
 
-            old_to_new_keys[ch_key] = new_issue.key
-            
-            attachments = fields.get("attachment", [])
+        asyncio.run(_migrate())
 
-            for att in attachments:
-                file_data = download_attachment(
-                    att["content"],  # URL du fichier
-                    auth=HTTPBasicAuth(st.session_state.username, st.session_state.token)
-                )
-                # Ici on envoie le nom et les données
-                migrate_attachment_child(jira, auth, file_data, new_issue.key,project_suffix = selected_label)
-
-            current_step += 1
-            progress_bar.progress(current_step / total_steps)
-
-        st.success(f"Issues creation complete, migrating dependencies...")
-
-        for old_key, links in child_links_map.items():
-            new_key = old_to_new_keys.get(old_key)
-            if not new_key:
-                continue
-            for link in links:
-                linked_old_key = link["key"]
-                linked_new_key = old_to_new_keys.get(linked_old_key)
-                if not linked_new_key:
-                    continue  # ignore les liens vers des issues hors template
-                if link["direction"] == "outward":
-                    jira.create_issue_link(type=link["type"], inwardIssue=new_key, outwardIssue=linked_new_key)
-                else:
-                    jira.create_issue_link(type=link["type"], inwardIssue=linked_new_key, outwardIssue=new_key)
-                    
         st.success("Successful migration!")
 
     except Exception as e: